@@ -16,6 +16,9 @@ df['day_of_week'] = df['transaction_datetime'].dt.day_name()
 df['amount_bucket'] = pd.cut(df['amount'], bins=[0,500,2000,5000,10000,50000], labels=['Micro (<500)','Small (500-2K)','Medium (2K-5K)','Large (5K-10K)','High Value (10K+)'])
 df['time_slot'] = pd.cut(df['txn_hour'], bins=[-1,5,11,16,21,24], labels=['Night','Morning','Afternoon','Evening','Night2'])
 df['time_slot'] = df['time_slot'].replace('Night2','Night')
+# 0/1 status indicators: success/failure counts and rates become plain groupby sum/mean
+df['_is_success'] = df['status'].eq('Success').astype('int8')
+df['_is_failed'] = df['status'].eq('Failed').astype('int8')
 
 wb = Workbook()
 
@@ -25,6 +28,16 @@ header_fill = PatternFill('solid', fgColor='2F5496')
 subheader_fill = PatternFill('solid', fgColor='D6E4F0')
 subheader_font = Font(name='Arial', bold=True, size=10, color='1F3864')
 data_font = Font(name='Arial', size=10)
+section_font = Font(name='Arial', bold=True, size=13, color='1F3864')
+panel_title_font = Font(name='Arial', bold=True, size=12, color='1F3864')
+label_font = Font(name='Arial', bold=True, size=10)
+kpi_value_font = Font(name='Arial', size=11, bold=True, color='2F5496')
+impact_label_font = Font(name='Arial', bold=True, size=11)
+impact_value_font = Font(name='Arial', bold=True, size=12, color='C00000')
+impact_sub_font = Font(name='Arial', bold=True, size=11, color='C00000')
+header_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
+center_align = Alignment(horizontal='center')
+left_align = Alignment(horizontal='left')
 number_fmt = '#,##0'
 decimal_fmt = '#,##0.00'
 pct_fmt = '0.0%'
@@ -44,7 +57,7 @@ def write_header(ws, row, headers, col_start=1):
         cell = ws.cell(row=row, column=col_start+i, value=h)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        cell.alignment = header_align
         cell.border = thin_border
 
 def write_data_row(ws, row, values, col_start=1, formats=None):
@@ -52,7 +65,7 @@ def write_data_row(ws, row, values, col_start=1, formats=None):
         cell = ws.cell(row=row, column=col_start+i, value=v)
         cell.font = data_font
         cell.border = thin_border
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = center_align
         if formats and i < len(formats) and formats[i]:
             cell.number_format = formats[i]
 
@@ -63,8 +76,8 @@ def set_col_widths(ws, widths):
 def add_section_title(ws, row, title, merge_end=7):
     ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=merge_end)
     cell = ws.cell(row=row, column=1, value=title)
-    cell.font = Font(name='Arial', bold=True, size=13, color='1F3864')
-    cell.alignment = Alignment(horizontal='left')
+    cell.font = section_font
+    cell.alignment = left_align
 
 # ==============================================================================
 # SHEET 1: EXECUTIVE DASHBOARD
@@ -105,13 +118,13 @@ kpis = [
 
 for i, (label, val, fmt) in enumerate(kpis):
     r = kpi_row + 1 + i
-    ws1.cell(row=r, column=1, value=label).font = Font(name='Arial', bold=True, size=10)
+    ws1.cell(row=r, column=1, value=label).font = label_font
     ws1.cell(row=r, column=1).border = thin_border
     c = ws1.cell(row=r, column=2, value=val)
     c.number_format = fmt
-    c.font = Font(name='Arial', size=11, bold=True, color='2F5496')
+    c.font = kpi_value_font
     c.border = thin_border
-    c.alignment = Alignment(horizontal='center')
+    c.alignment = center_align
     if label == 'Success Rate (%)':
         c.fill = green_fill
     elif label == 'Failure Rate (%)':
@@ -120,12 +133,12 @@ for i, (label, val, fmt) in enumerate(kpis):
 # Payment Method Breakdown (right side)
 pm_row = 3
 pm_col = 4
-ws1.cell(row=pm_row, column=pm_col, value='Payment Method Summary').font = Font(name='Arial', bold=True, size=12, color='1F3864')
+ws1.cell(row=pm_row, column=pm_col, value='Payment Method Summary').font = panel_title_font
 write_header(ws1, pm_row+1, ['Payment Method', 'Transactions', 'Success Rate', 'Avg Amount (₹)'], pm_col)
 
 method_stats = df.groupby('payment_method').agg(
     txn_count=('transaction_id','count'),
-    success=('status', lambda x: (x=='Success').sum()),
+    success=('_is_success','sum'),
     avg_amt=('amount','mean')
 ).reset_index()
 method_stats['success_rate'] = method_stats['success'] / method_stats['txn_count']
@@ -149,8 +162,8 @@ add_section_title(ws2, 1, "TRANSACTION SUCCESS RATE ANALYSIS")
 # Monthly success rate table
 monthly = df.groupby('txn_month').agg(
     total=('transaction_id','count'),
-    success=('status', lambda x: (x=='Success').sum()),
-    failed=('status', lambda x: (x=='Failed').sum()),
+    success=('_is_success','sum'),
+    failed=('_is_failed','sum'),
     volume=('amount','sum')
 ).reset_index()
 monthly['success_rate'] = monthly['success'] / monthly['total']
@@ -182,7 +195,7 @@ city_row = 5 + len(monthly) + 18
 add_section_title(ws2, city_row, "Success Rate by City")
 city_stats = df.groupby('city').agg(
     total=('transaction_id','count'),
-    success=('status', lambda x: (x=='Success').sum()),
+    success=('_is_success','sum'),
     avg_amt=('amount','mean')
 ).reset_index()
 city_stats['success_rate'] = city_stats['success'] / city_stats['total']
@@ -209,7 +222,7 @@ hourly = df.groupby('txn_hour').agg(
     total=('transaction_id','count'),
     volume=('amount','sum'),
     avg_amt=('amount','mean'),
-    success_rate=('status', lambda x: (x=='Success').mean())
+    success_rate=('_is_success','mean')
 ).reset_index()
 
 write_header(ws3, 3, ['Hour', 'Total Txn', 'Volume (₹)', 'Avg Amount (₹)', 'Success Rate'])
@@ -242,7 +255,7 @@ day_order = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sund
 daily = df.groupby('day_of_week').agg(
     total=('transaction_id','count'),
     volume=('amount','sum'),
-    success_rate=('status', lambda x: (x=='Success').mean())
+    success_rate=('_is_success','mean')
 ).reindex(day_order).reset_index()
 
 write_header(ws3, dow_row+1, ['Day', 'Total Txn', 'Volume (₹)', 'Success Rate'])
@@ -257,7 +270,7 @@ add_section_title(ws3, ts_row, "Time Slot Summary")
 time_slots = df.groupby('time_slot').agg(
     total=('transaction_id','count'),
     volume=('amount','sum'),
-    success_rate=('status', lambda x: (x=='Success').mean())
+    success_rate=('_is_success','mean')
 ).reset_index()
 
 write_header(ws3, ts_row+1, ['Time Slot', 'Total Txn', 'Volume (₹)', 'Success Rate'])
@@ -327,17 +340,17 @@ for i, row_data in method_fail.iterrows():
 ri_row = fm_row + 9
 add_section_title(ws4, ri_row, "Revenue Impact Summary")
 total_lost = failed_df['amount'].sum()
-ws4.cell(row=ri_row+1, column=1, value="Total Lost Revenue (₹)").font = Font(name='Arial', bold=True, size=11)
+ws4.cell(row=ri_row+1, column=1, value="Total Lost Revenue (₹)").font = impact_label_font
 c = ws4.cell(row=ri_row+1, column=2, value=total_lost)
 c.number_format = currency_fmt
-c.font = Font(name='Arial', bold=True, size=12, color='C00000')
+c.font = impact_value_font
 c.fill = red_fill
 
 avg_lost = failed_df['amount'].mean()
-ws4.cell(row=ri_row+2, column=1, value="Avg Failed Transaction (₹)").font = Font(name='Arial', bold=True, size=11)
+ws4.cell(row=ri_row+2, column=1, value="Avg Failed Transaction (₹)").font = impact_label_font
 c2 = ws4.cell(row=ri_row+2, column=2, value=avg_lost)
 c2.number_format = currency_fmt
-c2.font = Font(name='Arial', bold=True, size=11, color='C00000')
+c2.font = impact_sub_font
 
 
 # ==============================================================================
@@ -350,12 +363,15 @@ set_col_widths(ws5, [22,15,18,18,15])
 add_section_title(ws5, 1, "USER ACTIVITY TRENDS")
 
 # User Segmentation
+# Mask non-successful amounts up front so total_spent is a plain groupby sum
+df['_amt_if_success'] = df['amount'].where(df['status'].eq('Success'), 0.0)
 user_stats = df.groupby('user_id').agg(
-    txn_count=('transaction_id','count'),
-    total_spent=('amount', lambda x: x[df.loc[x.index, 'status']=='Success'].sum()),
+    txn_count=('transaction_id','size'),
+    total_spent=('_amt_if_success','sum'),
     avg_amount=('amount','mean'),
     methods_used=('payment_method','nunique')
 ).reset_index()
+df.drop(columns=['_amt_if_success'], inplace=True)
 
 def segment(cnt):
     if cnt >= 20: return 'Power User (20+)'
@@ -413,7 +429,11 @@ for i, row_data in mau.iterrows():
 # Top 15 Users
 top_row = mau_row + 2 + len(mau) + 2
 add_section_title(ws5, top_row, "Top 15 Users by Spend", merge_end=5)
-top_users = user_stats.nlargest(15, 'total_spent')
+# argpartition selects the top 15 in O(N); only those 15 rows get sorted
+spent = user_stats['total_spent'].to_numpy()
+k = min(15, len(spent))
+top_idx = np.argpartition(-spent, k - 1)[:k]
+top_users = user_stats.iloc[top_idx].sort_values('total_spent', ascending=False)
 write_header(ws5, top_row+1, ['User ID', 'Total Txn', 'Total Spent (₹)', 'Avg Amount (₹)', 'Methods Used'])
 for i, (_, row_data) in enumerate(top_users.iterrows()):
     r = top_row + 2 + i
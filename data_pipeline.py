@@ -16,7 +16,10 @@ This pipeline:
 
 import pandas as pd
 import numpy as np
+import glob
+import hashlib
 import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -30,8 +33,39 @@ print("=" * 60)
 script_dir = os.path.dirname(os.path.abspath(__file__))
 txn_path = os.path.join(script_dir, 'transactions_raw.csv')
 user_path = os.path.join(script_dir, 'user_profiles.csv')
+output_path = os.path.join(script_dir, 'transactions_cleaned.csv')
 
-df = pd.read_csv(txn_path)
+# Skip the whole pipeline when neither the raw inputs nor this script changed since the last run
+with open(os.path.abspath(__file__), 'rb') as f:
+    script_bytes = f.read()
+cache_key = hashlib.blake2b(
+    script_bytes
+    + f"{os.path.getmtime(txn_path)}-{os.path.getsize(txn_path)}-"
+      f"{os.path.getmtime(user_path)}-{os.path.getsize(user_path)}".encode()
+).hexdigest()[:16]
+cache_path = os.path.join(script_dir, f'transactions_cleaned.{cache_key}.parquet')
+
+if os.path.exists(cache_path):
+    print(f"\n  Cache hit: {os.path.basename(cache_path)}")
+    # The snapshot is written right after the CSV, so a CSV that is missing or newer than
+    # it was deleted, edited or truncated since — rebuild it from the snapshot
+    if not os.path.exists(output_path) or os.path.getmtime(output_path) > os.path.getmtime(cache_path):
+        pd.read_parquet(cache_path).to_csv(output_path, index=False, chunksize=65536)
+        os.utime(cache_path)  # snapshot stays at least as new as the CSV it matches
+        print("  Rebuilt transactions_cleaned.csv from the cached snapshot")
+    print("  Output: transactions_cleaned.csv (unchanged inputs and script, pipeline skipped)")
+    sys.exit(0)
+
+# Numeric columns are typed at read time (float64: rupee amounts and per-user sums need the precision).
+# A malformed cell falls back to the lenient path, where it becomes NaN instead of aborting the run.
+numeric_cols = ['amount', 'processing_time_sec', 'cashback_earned',
+                'discount_applied', 'refund_amount']
+try:
+    df = pd.read_csv(txn_path, dtype={col: 'float64' for col in numeric_cols})
+except ValueError:
+    df = pd.read_csv(txn_path)
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
 users = pd.read_csv(user_path)
 
 print(f"\n[1] Raw data loaded:")
@@ -46,12 +80,6 @@ print(f"\n[2] Fixing data types...")
 # Parse datetime
 df['transaction_datetime'] = pd.to_datetime(df['transaction_datetime'])
 
-# Ensure numeric columns
-numeric_cols = ['amount', 'processing_time_sec', 'cashback_earned',
-                'discount_applied', 'refund_amount']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
 # Ensure boolean columns
 bool_cols = ['is_flagged', 'is_refunded']
 for col in bool_cols:
@@ -113,18 +141,9 @@ df['week_number'] = df['transaction_datetime'].dt.isocalendar().week.astype(int)
 df['quarter'] = df['transaction_datetime'].dt.quarter
 df['quarter_label'] = 'Q' + df['quarter'].astype(str)
 
-# Time of day buckets
-def get_time_bucket(hour):
-    if 5 <= hour < 12:
-        return 'Morning'
-    elif 12 <= hour < 17:
-        return 'Afternoon'
-    elif 17 <= hour < 21:
-        return 'Evening'
-    else:
-        return 'Night'
-
-df['time_bucket'] = df['hour'].apply(get_time_bucket)
+# Time of day buckets (hour -> label lookup table)
+hour_buckets = np.array(['Night'] * 5 + ['Morning'] * 7 + ['Afternoon'] * 5 + ['Evening'] * 4 + ['Night'] * 3)
+df['time_bucket'] = hour_buckets[df['hour'].to_numpy()]
 
 # Is month end (last 5 days) — salary spending pattern
 df['is_month_end'] = (df['day'] >= 26).astype(int)
@@ -144,22 +163,11 @@ print(f"           is_month_end, is_month_start, is_festival_season ✓")
 # ============================================================
 print(f"\n[5] Engineering amount-based features...")
 
-# Amount buckets
-def get_amount_bucket(amount):
-    if amount < 100:
-        return 'Micro (<₹100)'
-    elif amount < 500:
-        return 'Small (₹100-500)'
-    elif amount < 2000:
-        return 'Medium (₹500-2K)'
-    elif amount < 10000:
-        return 'Large (₹2K-10K)'
-    elif amount < 50000:
-        return 'High (₹10K-50K)'
-    else:
-        return 'Premium (₹50K+)'
-
-df['amount_bucket'] = df['amount'].apply(get_amount_bucket)
+# Amount buckets (lower edge inclusive)
+amount_edges = np.array([100, 500, 2000, 10000, 50000])
+amount_labels = np.array(['Micro (<₹100)', 'Small (₹100-500)', 'Medium (₹500-2K)',
+                          'Large (₹2K-10K)', 'High (₹10K-50K)', 'Premium (₹50K+)'])
+df['amount_bucket'] = amount_labels[np.searchsorted(amount_edges, df['amount'].to_numpy(), side='right')]
 
 # Net amount after discount and cashback
 df['net_amount'] = df['amount'] - df['discount_applied'] - df['cashback_earned']
@@ -209,9 +217,7 @@ user_avg_spend.columns = ['user_id', 'user_avg_txn_amount']
 user_avg_spend['user_avg_txn_amount'] = user_avg_spend['user_avg_txn_amount'].round(2)
 
 # Failure rate per user
-user_fail = df.groupby('user_id').apply(
-    lambda x: (x['status'] == 'Failed').sum() / len(x) * 100
-).reset_index()
+user_fail = (df['status'].eq('Failed').groupby(df['user_id']).mean() * 100).reset_index()
 user_fail.columns = ['user_id', 'user_failure_rate_pct']
 user_fail['user_failure_rate_pct'] = user_fail['user_failure_rate_pct'].round(2)
 
@@ -224,17 +230,9 @@ df['user_total_spend'] = df['user_total_spend'].fillna(0)
 df['user_avg_txn_amount'] = df['user_avg_txn_amount'].fillna(0)
 
 # User spending tier based on total spend
-def get_spending_tier(spend):
-    if spend < 10000:
-        return 'Low'
-    elif spend < 50000:
-        return 'Medium'
-    elif spend < 200000:
-        return 'High'
-    else:
-        return 'Very High'
-
-df['user_spending_tier'] = df['user_total_spend'].apply(get_spending_tier)
+spend_edges = np.array([10000, 50000, 200000])
+spend_labels = np.array(['Low', 'Medium', 'High', 'Very High'])
+df['user_spending_tier'] = spend_labels[np.searchsorted(spend_edges, df['user_total_spend'].to_numpy(), side='right')]
 
 print(f"    Added: user_total_txns, user_total_spend, user_avg_txn_amount,")
 print(f"           user_failure_rate_pct, user_spending_tier ✓")
@@ -244,21 +242,11 @@ print(f"           user_failure_rate_pct, user_spending_tier ✓")
 # ============================================================
 print(f"\n[8] Categorizing processing times...")
 
-def get_speed_category(row):
-    if row['status'] == 'Failed':
-        return 'Failed'
-    elif row['processing_time_sec'] <= 1.0:
-        return 'Instant'
-    elif row['processing_time_sec'] <= 2.0:
-        return 'Fast'
-    elif row['processing_time_sec'] <= 5.0:
-        return 'Normal'
-    elif row['processing_time_sec'] <= 15.0:
-        return 'Slow'
-    else:
-        return 'Very Slow'
-
-df['processing_speed'] = df.apply(get_speed_category, axis=1)
+# Upper edge inclusive; failed transactions override the speed bucket
+speed_edges = np.array([1.0, 2.0, 5.0, 15.0])
+speed_labels = np.array(['Instant', 'Fast', 'Normal', 'Slow', 'Very Slow'])
+speed = speed_labels[np.searchsorted(speed_edges, df['processing_time_sec'].to_numpy(), side='left')]
+df['processing_speed'] = np.where(df['status'].eq('Failed').to_numpy(), 'Failed', speed)
 
 print(f"    Added: processing_speed ✓")
 
@@ -303,8 +291,12 @@ column_order = [
 df = df[column_order]
 
 # Save cleaned dataset
-output_path = os.path.join(script_dir, 'transactions_cleaned.csv')
-df.to_csv(output_path, index=False)
+df.to_csv(output_path, index=False, chunksize=65536)  # bounded formatter memory as N grows
+
+# Refresh the run cache (older keys belong to previous raw inputs)
+for stale in glob.glob(os.path.join(script_dir, 'transactions_cleaned.*.parquet')):
+    os.remove(stale)
+df.to_parquet(cache_path, index=False)
 
 # ============================================================
 # 10. VALIDATION SUMMARY
@@ -34,6 +34,47 @@ df = pd.read_csv(os.path.join(script_dir, 'transactions_cleaned.csv'))
 df['transaction_datetime'] = pd.to_datetime(df['transaction_datetime'])
 df['date'] = pd.to_datetime(df['date'])
 
+# Low-cardinality string columns as categoricals: group keys become int codes
+cat_cols = ['payment_method', 'category', 'status', 'spending_persona', 'city',
+            'platform', 'device_type', 'processing_speed', 'failure_reason', 'fraud_reason']
+for col in cat_cols:
+    df[col] = df[col].astype('category')
+
+# Ordered categoricals: groupby returns age groups / tiers in display order
+age_order = ['18-24', '25-34', '35-44', '45-54', '55+']
+tier_order = ['New', 'Regular', 'Premium', 'VIP']
+df['age_group'] = pd.Categorical(df['age_group'], categories=age_order, ordered=True)
+df['customer_tier'] = pd.Categorical(df['customer_tier'], categories=tier_order, ordered=True)
+
+# Downcast flag and calendar columns to cut the bytes moved by every later scan
+# (amount stays float64 so rupee sums and means match the cleaned data exactly)
+for col in ['is_weekend', 'is_flagged', 'is_refunded']:
+    df[col] = df[col].astype(bool)
+for col in ['year', 'month', 'quarter', 'day', 'day_of_week', 'hour', 'week_number',
+            'is_month_start', 'is_month_end', 'is_festival_season']:
+    df[col] = df[col].astype('int16')
+
+# Status / flag predicates are evaluated once here and reused by every chart below
+status = df['status'].to_numpy()
+is_success = status == 'Success'
+is_failed = status == 'Failed'
+is_pending = status == 'Pending'
+is_flagged = df['is_flagged'].to_numpy(dtype=bool)
+is_refunded = df['is_refunded'].to_numpy(dtype=bool)
+
+success_df = df[is_success]
+failed = df[is_failed]
+flagged = df[is_flagged]
+refunded = df[is_refunded]
+
+# Amount counted only for successful transactions — volume sums need no filtered copy of df
+df['success_amount'] = np.where(is_success, df['amount'].to_numpy(), 0.0)
+# 0/1 indicator columns: per-group rates become a plain groupby mean
+df['_is_success'] = is_success.astype('float64')
+df['_is_failed'] = is_failed.astype('float64')
+df['_failed_amount'] = df['amount'].where(is_failed, 0)
+df['_success_proc_time'] = df['processing_time_sec'].where(is_success, 0)
+
 # Style config
 sns.set_theme(style='whitegrid', font_scale=1.1)
 COLORS = {
@@ -59,30 +100,185 @@ print(f"  Charts will be saved to: {chart_dir}/")
 
 chart_count = 0
 
+# One Figure per (rows, cols, figsize) shape, cleared and reused by later charts of that shape
+fig_cache = {}
+
+def get_figure(nrows=1, ncols=1, figsize=(10, 6)):
+    key = (nrows, ncols, figsize)
+    fig = fig_cache.get(key)
+    if fig is None:
+        fig = fig_cache[key] = plt.figure(figsize=figsize)
+    else:
+        fig.clf()
+    return fig, fig.subplots(nrows, ncols)
+
 def save_chart(fig, name):
     global chart_count
     chart_count += 1
     filepath = os.path.join(chart_dir, f"{name}.png")
-    fig.savefig(filepath, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
+    # Exploratory charts: lower dpi and fast zlib level keep PNG encoding cheap
+    fig.savefig(filepath, dpi=80, bbox_inches='tight', facecolor='white',
+                pil_kwargs={'compress_level': 1})
     print(f"  [{chart_count:02d}] Saved: {name}.png")
 
+# ============================================================
+# AGGREGATIONS (all chart data is computed here; the chart sections only render)
+# ============================================================
+# Each groupby is fed only the key + the columns its aggregations read
+method_agg = df[['payment_method', 'transaction_id', 'amount', '_is_success', '_is_failed',
+                 '_failed_amount', 'cashback_earned', '_success_proc_time']].groupby('payment_method', observed=True).agg(
+    count=('transaction_id', 'count'),
+    avg_amount=('amount', 'mean'),
+    success_rate=('_is_success', 'mean'),
+    fail_rate=('_is_failed', 'mean'),
+    success_count=('_is_success', 'sum'),
+    fail_count=('_is_failed', 'sum'),
+    lost_revenue=('_failed_amount', 'sum'),
+    cashback=('cashback_earned', 'sum'),
+    success_proc_time=('_success_proc_time', 'sum')
+)
+method_agg[['success_rate', 'fail_rate']] *= 100
+method_agg['fail_count'] = method_agg['fail_count'].astype(int)
+method_agg['proc_time'] = method_agg['success_proc_time'] / method_agg['success_count']
+
+cat_agg = df[['category', 'transaction_id', 'amount', 'discount_applied',
+              'is_refunded', 'refund_amount']].groupby('category', observed=True).agg(
+    count=('transaction_id', 'count'),
+    total_volume=('amount', 'sum'),
+    avg_amount=('amount', 'mean'),
+    total_discount=('discount_applied', 'sum'),
+    refund_count=('is_refunded', 'sum'),
+    total_refunded=('refund_amount', 'sum')
+)
+
+# Chart 2: monthly trend
+monthly = df[['month', 'transaction_id', '_is_success', 'amount']].groupby('month', observed=True).agg(
+    txn_count=('transaction_id', 'count'),
+    success_count=('_is_success', 'sum'),
+    total_volume=('amount', 'sum')
+)
+monthly['success_rate'] = (monthly['success_count'] / monthly['txn_count'] * 100).round(2)
+
+# Chart 3: payment methods
+method_stats = method_agg[['count', 'success_rate', 'avg_amount']].sort_values('count', ascending=True)
+
+# Chart 4: day x hour heatmap
+day_order = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sunday']
+pivot = df[['day_name', 'hour']].groupby(['day_name', 'hour'], observed=True).size().unstack(fill_value=0).reindex(day_order)
+
+# Chart 5: categories
+cat_stats = cat_agg[['count', 'total_volume', 'avg_amount']].sort_values('count', ascending=False)
+
+# Chart 6: failure reasons & failure rate by method
+reason_counts = failed['failure_reason'].value_counts()
+reason_counts = reason_counts[reason_counts > 0].head(10).iloc[::-1]  # drop unused categories
+method_fail = method_agg['fail_rate'].sort_values(ascending=True)
+
+# Chart 7: lost revenue
+lost_revenue = method_agg[['lost_revenue', 'fail_count']].rename(columns={'lost_revenue': 'total_lost'})
+lost_revenue = lost_revenue.sort_values('total_lost', ascending=True)
+
+# Chart 8: age groups
+age_stats = df[['age_group', 'transaction_id', 'user_id', 'amount', '_is_success']].groupby('age_group', observed=True).agg(
+    txn_count=('transaction_id', 'count'),
+    unique_users=('user_id', 'nunique'),
+    avg_amount=('amount', 'mean'),
+    success_rate=('_is_success', 'mean')
+)
+age_stats['success_rate'] *= 100
+
+# Chart 9: customer tiers
+tier_stats = df[['customer_tier', 'transaction_id', 'success_amount', 'amount', '_is_success',
+                 'cashback_earned']].groupby('customer_tier', observed=True).agg(
+    txn_count=('transaction_id', 'count'),
+    total_revenue=('success_amount', 'sum'),
+    avg_amount=('amount', 'mean'),
+    success_rate=('_is_success', 'mean'),
+    cashback=('cashback_earned', 'sum')
+)
+tier_stats['success_rate'] *= 100
+
+# Chart 10: spending personas
+persona_stats = success_df[['spending_persona', 'user_id', 'transaction_id', 'amount']].groupby('spending_persona', observed=True).agg(
+    users=('user_id', 'nunique'),
+    txn_count=('transaction_id', 'count'),
+    avg_amount=('amount', 'mean'),
+    total_spend=('amount', 'sum')
+)
+persona_stats['spend_per_user'] = persona_stats['total_spend'] / persona_stats['users']
+persona_order = persona_stats.sort_values('avg_amount', ascending=True)
+persona_order2 = persona_stats.sort_values('spend_per_user', ascending=True)
+
+# Chart 11: cities
+city_stats = df[['city', 'transaction_id', '_is_success', 'amount']].groupby('city', observed=True).agg(
+    txn_count=('transaction_id', 'count'),
+    success_rate=('_is_success', 'mean'),
+    avg_amount=('amount', 'mean'),
+    total_volume=('amount', 'sum')
+).sort_values('txn_count', ascending=True)
+city_stats['success_rate'] *= 100
+
+# Chart 12: platforms & devices
+platform_stats = df[['platform', 'transaction_id', '_is_success']].groupby('platform', observed=True).agg(
+    count=('transaction_id', 'count'),
+    success_rate=('_is_success', 'mean')
+)
+platform_stats['success_rate'] *= 100
+
+device_stats = df[['device_type', 'transaction_id', 'amount']].groupby('device_type', observed=True).agg(
+    count=('transaction_id', 'count'),
+    avg_amount=('amount', 'mean')
+).sort_values('count', ascending=False)
+
+# Chart 13: fraud reasons & flagged amounts
+fraud_reasons = flagged['fraud_reason'].value_counts()
+fraud_reasons = fraud_reasons[fraud_reasons > 0].iloc[::-1]  # drop unused categories (e.g. 'None')
+amt = df['amount'].to_numpy()
+normal_amt = np.minimum(amt[~is_flagged], 50000.0)
+flagged_amt = np.minimum(amt[is_flagged], 50000.0)
+
+# Chart 14: cashback & discounts
+cb_method = method_agg.loc[method_agg['cashback'] > 0, 'cashback'].sort_values(ascending=True)
+disc_cat = cat_agg.loc[cat_agg['total_discount'] > 0, 'total_discount'].sort_values(ascending=True)
+
+# Chart 15: refunds
+ref_cat = cat_agg.loc[cat_agg['refund_count'] > 0, ['refund_count', 'total_refunded']]
+ref_cat = ref_cat.sort_values('refund_count', ascending=True)
+full_refund = refunded['refund_amount'].to_numpy() >= refunded['amount'].to_numpy() * 0.99
+ref_labels, ref_counts = np.unique(np.where(full_refund, 'Full Refund', 'Partial Refund'), return_counts=True)
+
+# Chart 16: weekday vs weekend
+wk_stats = df[['is_weekend', 'transaction_id', 'amount', '_is_success']].groupby('is_weekend', observed=True).agg(
+    txn_count=('transaction_id', 'count'),
+    avg_amount=('amount', 'mean'),
+    success_rate=('_is_success', 'mean'),
+    total_volume=('amount', 'sum')
+)
+wk_stats['success_rate'] *= 100
+wk_labels = np.where(wk_stats.index, 'Weekend', 'Weekday')
+
+# Chart 17: processing time
+method_proc = method_agg['proc_time'].sort_values()
+speed_order = ['Instant', 'Fast', 'Normal', 'Slow', 'Very Slow']
+speed_counts = df[~is_failed]['processing_speed'].value_counts().reindex(speed_order).fillna(0)
+
+
 # ============================================================
 # CHART 1: KPI OVERVIEW DASHBOARD
 # ============================================================
 print("\n--- Generating Charts ---\n")
 
-fig, axes = plt.subplots(2, 4, figsize=(20, 8))
+fig, axes = get_figure(2, 4, figsize=(20, 8))
 fig.suptitle('Key Performance Indicators — 2024 Overview', fontsize=18, fontweight='bold', y=1.02)
 
 kpis = [
     ('Total Transactions', f"{len(df):,}", COLORS['primary']),
-    ('Success Rate', f"{(df['status']=='Success').mean()*100:.1f}%", COLORS['success']),
-    ('Total Volume (₹)', f"₹{df[df['status']=='Success']['amount'].sum()/1e7:.2f} Cr", COLORS['purple']),
+    ('Success Rate', f"{is_success.mean()*100:.1f}%", COLORS['success']),
+    ('Total Volume (₹)', f"₹{df['success_amount'].sum()/1e7:.2f} Cr", COLORS['purple']),
     ('Unique Users', f"{df['user_id'].nunique()}", COLORS['teal']),
-    ('Avg Txn Value', f"₹{df[df['status']=='Success']['amount'].mean():,.0f}", COLORS['warning']),
-    ('Fraud Flags', f"{df['is_flagged'].sum()} ({df['is_flagged'].mean()*100:.1f}%)", COLORS['danger']),
-    ('Refunds', f"{df['is_refunded'].sum()} ({df['is_refunded'].mean()*100:.1f}%)", COLORS['pink']),
+    ('Avg Txn Value', f"₹{success_df['amount'].mean():,.0f}", COLORS['warning']),
+    ('Fraud Flags', f"{is_flagged.sum()} ({is_flagged.mean()*100:.1f}%)", COLORS['danger']),
+    ('Refunds', f"{is_refunded.sum()} ({is_refunded.mean()*100:.1f}%)", COLORS['pink']),
     ('Total Savings', f"₹{df['total_savings'].sum()/1e5:.1f}L", COLORS['success']),
 ]
 
@@ -105,24 +301,17 @@ save_chart(fig, '01_kpi_overview')
 # ============================================================
 # CHART 2: MONTHLY TRANSACTION TREND
 # ============================================================
-monthly = df.groupby('month').agg(
-    txn_count=('transaction_id', 'count'),
-    success_count=('status', lambda x: (x == 'Success').sum()),
-    total_volume=('amount', 'sum')
-).reset_index()
-monthly['success_rate'] = (monthly['success_count'] / monthly['txn_count'] * 100).round(2)
-
-fig, ax1 = plt.subplots(figsize=(14, 6))
+fig, ax1 = get_figure(figsize=(14, 6))
 month_labels = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec']
 
-bar = ax1.bar(monthly['month'], monthly['txn_count'], color=COLORS['primary'], alpha=0.7, label='Transaction Count')
+bar = ax1.bar(monthly.index, monthly['txn_count'], color=COLORS['primary'], alpha=0.7, label='Transaction Count', rasterized=True)
 ax1.set_xlabel('Month', fontsize=12)
 ax1.set_ylabel('Transaction Count', fontsize=12, color=COLORS['primary'])
 ax1.set_xticks(range(1, 13))
 ax1.set_xticklabels(month_labels)
 
 ax2 = ax1.twinx()
-ax2.plot(monthly['month'], monthly['success_rate'], color=COLORS['success'],
+ax2.plot(monthly.index, monthly['success_rate'], color=COLORS['success'],
          marker='o', linewidth=2.5, label='Success Rate %')
 ax2.set_ylabel('Success Rate (%)', fontsize=12, color=COLORS['success'])
 ax2.set_ylim(85, 100)
@@ -140,16 +329,10 @@ save_chart(fig, '02_monthly_trend')
 # ============================================================
 # CHART 3: PAYMENT METHOD DISTRIBUTION & SUCCESS RATE
 # ============================================================
-method_stats = df.groupby('payment_method').agg(
-    count=('transaction_id', 'count'),
-    success_rate=('status', lambda x: (x == 'Success').mean() * 100),
-    avg_amount=('amount', 'mean')
-).sort_values('count', ascending=True).reset_index()
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(16, 6))
 
 # Left: Horizontal bar — transaction count
-ax1.barh(method_stats['payment_method'], method_stats['count'], color=PALETTE[:5])
+ax1.barh(method_stats.index, method_stats['count'], color=PALETTE[:5], rasterized=True)
 ax1.set_xlabel('Transaction Count', fontsize=12)
 ax1.set_title('Transactions by Payment Method', fontsize=14, fontweight='bold')
 for i, v in enumerate(method_stats['count']):
@@ -158,7 +341,7 @@ for i, v in enumerate(method_stats['count']):
 # Right: Bar — success rate
 colors_sr = [COLORS['success'] if r > 92 else COLORS['warning'] if r > 88 else COLORS['danger']
              for r in method_stats['success_rate']]
-ax2.barh(method_stats['payment_method'], method_stats['success_rate'], color=colors_sr)
+ax2.barh(method_stats.index, method_stats['success_rate'], color=colors_sr, rasterized=True)
 ax2.set_xlabel('Success Rate (%)', fontsize=12)
 ax2.set_title('Success Rate by Payment Method', fontsize=14, fontweight='bold')
 ax2.set_xlim(80, 100)
@@ -172,12 +355,7 @@ save_chart(fig, '03_payment_method_analysis')
 # ============================================================
 # CHART 4: HOURLY TRANSACTION HEATMAP
 # ============================================================
-hourly_day = df.groupby(['day_name', 'hour']).size().reset_index(name='count')
-day_order = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sunday']
-pivot = hourly_day.pivot_table(index='day_name', columns='hour', values='count', fill_value=0)
-pivot = pivot.reindex(day_order)
-
-fig, ax = plt.subplots(figsize=(18, 6))
+fig, ax = get_figure(figsize=(18, 6))
 sns.heatmap(pivot, cmap='YlOrRd', ax=ax, linewidths=0.5,
             cbar_kws={'label': 'Transaction Count'}, annot=False)
 ax.set_title('Transaction Heatmap: Day of Week × Hour', fontsize=16, fontweight='bold')
@@ -189,18 +367,12 @@ save_chart(fig, '04_hourly_heatmap')
 # ============================================================
 # CHART 5: CATEGORY DISTRIBUTION (Treemap-style bar)
 # ============================================================
-cat_stats = df.groupby('category').agg(
-    count=('transaction_id', 'count'),
-    total_volume=('amount', 'sum'),
-    avg_amount=('amount', 'mean')
-).sort_values('count', ascending=False).reset_index()
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(16, 7))
 
 # Left: Count
-bars = ax1.bar(range(len(cat_stats)), cat_stats['count'], color=PALETTE[:len(cat_stats)])
+bars = ax1.bar(range(len(cat_stats)), cat_stats['count'], color=PALETTE[:len(cat_stats)], rasterized=True)
 ax1.set_xticks(range(len(cat_stats)))
-ax1.set_xticklabels(cat_stats['category'], rotation=45, ha='right', fontsize=10)
+ax1.set_xticklabels(cat_stats.index, rotation=45, ha='right', fontsize=10)
 ax1.set_title('Transaction Count by Category', fontsize=14, fontweight='bold')
 ax1.set_ylabel('Count')
 for bar, val in zip(bars, cat_stats['count']):
@@ -208,9 +380,9 @@ for bar, val in zip(bars, cat_stats['count']):
              f"{val}", ha='center', fontsize=9, fontweight='bold')
 
 # Right: Volume
-bars2 = ax2.bar(range(len(cat_stats)), cat_stats['total_volume']/1e5, color=PALETTE[:len(cat_stats)])
+bars2 = ax2.bar(range(len(cat_stats)), cat_stats['total_volume']/1e5, color=PALETTE[:len(cat_stats)], rasterized=True)
 ax2.set_xticks(range(len(cat_stats)))
-ax2.set_xticklabels(cat_stats['category'], rotation=45, ha='right', fontsize=10)
+ax2.set_xticklabels(cat_stats.index, rotation=45, ha='right', fontsize=10)
 ax2.set_title('Transaction Volume by Category (₹ Lakhs)', fontsize=14, fontweight='bold')
 ax2.set_ylabel('Volume (₹ Lakhs)')
 
@@ -221,25 +393,19 @@ save_chart(fig, '05_category_distribution')
 # ============================================================
 # CHART 6: FAILURE ANALYSIS — REASONS & METHODS
 # ============================================================
-failed = df[df['status'] == 'Failed']
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(16, 7))
 
 # Left: Top failure reasons
-reason_counts = failed['failure_reason'].value_counts().head(10)
-ax1.barh(reason_counts.index[::-1], reason_counts.values[::-1], color=COLORS['danger'], alpha=0.8)
+ax1.barh(reason_counts.index, reason_counts.values, color=COLORS['danger'], alpha=0.8, rasterized=True)
 ax1.set_title('Top 10 Failure Reasons', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Count')
-for i, v in enumerate(reason_counts.values[::-1]):
+for i, v in enumerate(reason_counts.values):
     ax1.text(v + 1, i, str(v), va='center', fontsize=10)
 
 # Right: Failure rate by method
-method_fail = df.groupby('payment_method').apply(
-    lambda x: (x['status'] == 'Failed').mean() * 100
-).sort_values(ascending=True)
 colors_fail = [COLORS['danger'] if v > 8 else COLORS['warning'] if v > 5 else COLORS['success']
                for v in method_fail.values]
-ax2.barh(method_fail.index, method_fail.values, color=colors_fail)
+ax2.barh(method_fail.index, method_fail.values, color=colors_fail, rasterized=True)
 ax2.set_title('Failure Rate by Payment Method', fontsize=14, fontweight='bold')
 ax2.set_xlabel('Failure Rate (%)')
 for i, v in enumerate(method_fail.values):
@@ -252,12 +418,8 @@ save_chart(fig, '06_failure_analysis')
 # ============================================================
 # CHART 7: REVENUE IMPACT OF FAILURES
 # ============================================================
-lost_revenue = failed.groupby('payment_method')['amount'].agg(['sum','count','mean']).reset_index()
-lost_revenue.columns = ['payment_method', 'total_lost', 'fail_count', 'avg_lost']
-lost_revenue = lost_revenue.sort_values('total_lost', ascending=True)
-
-fig, ax = plt.subplots(figsize=(12, 6))
-bars = ax.barh(lost_revenue['payment_method'], lost_revenue['total_lost']/1e5, color=COLORS['danger'], alpha=0.8)
+fig, ax = get_figure(figsize=(12, 6))
+bars = ax.barh(lost_revenue.index, lost_revenue['total_lost']/1e5, color=COLORS['danger'], alpha=0.8, rasterized=True)
 ax.set_title('Lost Revenue from Failed Transactions (₹ Lakhs)', fontsize=14, fontweight='bold')
 ax.set_xlabel('Lost Revenue (₹ Lakhs)')
 for bar, val, cnt in zip(bars, lost_revenue['total_lost'], lost_revenue['fail_count']):
@@ -271,25 +433,14 @@ save_chart(fig, '07_revenue_impact_failures')
 # ============================================================
 # CHART 8: USER DEMOGRAPHICS — AGE GROUP ANALYSIS
 # ============================================================
-age_stats = df.groupby('age_group').agg(
-    txn_count=('transaction_id', 'count'),
-    unique_users=('user_id', 'nunique'),
-    avg_amount=('amount', 'mean'),
-    success_rate=('status', lambda x: (x == 'Success').mean() * 100)
-).reset_index()
-
-age_order = ['18-24', '25-34', '35-44', '45-54', '55+']
-age_stats['age_group'] = pd.Categorical(age_stats['age_group'], categories=age_order, ordered=True)
-age_stats = age_stats.sort_values('age_group')
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
-ax1.bar(age_stats['age_group'], age_stats['txn_count'], color=PALETTE[:5], alpha=0.85)
+ax1.bar(age_stats.index, age_stats['txn_count'], color=PALETTE[:5], alpha=0.85, rasterized=True)
 ax1.set_title('Transaction Count by Age Group', fontsize=14, fontweight='bold')
 ax1.set_ylabel('Transactions')
 ax1.set_xlabel('Age Group')
 
-ax2.bar(age_stats['age_group'], age_stats['avg_amount'], color=PALETTE[:5], alpha=0.85)
+ax2.bar(age_stats.index, age_stats['avg_amount'], color=PALETTE[:5], alpha=0.85, rasterized=True)
 ax2.set_title('Average Transaction Amount by Age Group', fontsize=14, fontweight='bold')
 ax2.set_ylabel('Avg Amount (₹)')
 ax2.set_xlabel('Age Group')
@@ -303,30 +454,18 @@ save_chart(fig, '08_age_group_analysis')
 # ============================================================
 # CHART 9: CUSTOMER TIER PERFORMANCE
 # ============================================================
-tier_stats = df.groupby('customer_tier').agg(
-    txn_count=('transaction_id', 'count'),
-    total_revenue=('amount', lambda x: x[df.loc[x.index, 'status'] == 'Success'].sum()),
-    avg_amount=('amount', 'mean'),
-    success_rate=('status', lambda x: (x == 'Success').mean() * 100),
-    cashback=('cashback_earned', 'sum')
-).reset_index()
-
-tier_order = ['New', 'Regular', 'Premium', 'VIP']
-tier_stats['customer_tier'] = pd.Categorical(tier_stats['customer_tier'], categories=tier_order, ordered=True)
-tier_stats = tier_stats.sort_values('customer_tier')
-
-fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+fig, axes = get_figure(1, 3, figsize=(18, 6))
 tier_colors = [COLORS['slate'], COLORS['primary'], COLORS['purple'], COLORS['warning']]
 
-axes[0].bar(tier_stats['customer_tier'], tier_stats['txn_count'], color=tier_colors)
+axes[0].bar(tier_stats.index, tier_stats['txn_count'], color=tier_colors, rasterized=True)
 axes[0].set_title('Transactions by Tier', fontsize=13, fontweight='bold')
 axes[0].set_ylabel('Count')
 
-axes[1].bar(tier_stats['customer_tier'], tier_stats['avg_amount'], color=tier_colors)
+axes[1].bar(tier_stats.index, tier_stats['avg_amount'], color=tier_colors, rasterized=True)
 axes[1].set_title('Avg Transaction Value by Tier', fontsize=13, fontweight='bold')
 axes[1].set_ylabel('Avg Amount (₹)')
 
-axes[2].bar(tier_stats['customer_tier'], tier_stats['success_rate'], color=tier_colors)
+axes[2].bar(tier_stats.index, tier_stats['success_rate'], color=tier_colors, rasterized=True)
 axes[2].set_title('Success Rate by Tier', fontsize=13, fontweight='bold')
 axes[2].set_ylabel('Success Rate (%)')
 axes[2].set_ylim(85, 100)
@@ -339,27 +478,17 @@ save_chart(fig, '09_customer_tier_analysis')
 # ============================================================
 # CHART 10: SPENDING PERSONA COMPARISON
 # ============================================================
-persona_stats = df[df['status'] == 'Success'].groupby('spending_persona').agg(
-    users=('user_id', 'nunique'),
-    txn_count=('transaction_id', 'count'),
-    avg_amount=('amount', 'mean'),
-    total_spend=('amount', 'sum')
-).reset_index()
-persona_stats['spend_per_user'] = persona_stats['total_spend'] / persona_stats['users']
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
-persona_order = persona_stats.sort_values('avg_amount', ascending=True)
-ax1.barh(persona_order['spending_persona'], persona_order['avg_amount'],
-         color=[COLORS['success'], COLORS['primary'], COLORS['warning'], COLORS['danger']])
+ax1.barh(persona_order.index, persona_order['avg_amount'],
+         color=[COLORS['success'], COLORS['primary'], COLORS['warning'], COLORS['danger']], rasterized=True)
 ax1.set_title('Avg Transaction Amount by Persona', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Avg Amount (₹)')
 for i, v in enumerate(persona_order['avg_amount']):
     ax1.text(v + 50, i, f"₹{v:,.0f}", va='center', fontsize=10, fontweight='bold')
 
-persona_order2 = persona_stats.sort_values('spend_per_user', ascending=True)
-ax2.barh(persona_order2['spending_persona'], persona_order2['spend_per_user']/1e3,
-         color=[COLORS['success'], COLORS['primary'], COLORS['warning'], COLORS['danger']])
+ax2.barh(persona_order2.index, persona_order2['spend_per_user']/1e3,
+         color=[COLORS['success'], COLORS['primary'], COLORS['warning'], COLORS['danger']], rasterized=True)
 ax2.set_title('Total Spend per User by Persona (₹K)', fontsize=14, fontweight='bold')
 ax2.set_xlabel('Spend per User (₹ Thousands)')
 
@@ -370,23 +499,16 @@ save_chart(fig, '10_spending_persona_analysis')
 # ============================================================
 # CHART 11: CITY-WISE ANALYSIS
 # ============================================================
-city_stats = df.groupby('city').agg(
-    txn_count=('transaction_id', 'count'),
-    success_rate=('status', lambda x: (x == 'Success').mean() * 100),
-    avg_amount=('amount', 'mean'),
-    total_volume=('amount', 'sum')
-).sort_values('txn_count', ascending=True).reset_index()
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(16, 8))
 
-ax1.barh(city_stats['city'], city_stats['txn_count'], color=COLORS['primary'], alpha=0.8)
+ax1.barh(city_stats.index, city_stats['txn_count'], color=COLORS['primary'], alpha=0.8, rasterized=True)
 ax1.set_title('Transaction Count by City', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Transactions')
 
 for i, v in enumerate(city_stats['txn_count']):
     ax1.text(v + 5, i, str(v), va='center', fontsize=9)
 
-ax2.barh(city_stats['city'], city_stats['total_volume']/1e5, color=COLORS['teal'], alpha=0.8)
+ax2.barh(city_stats.index, city_stats['total_volume']/1e5, color=COLORS['teal'], alpha=0.8, rasterized=True)
 ax2.set_title('Transaction Volume by City (₹ Lakhs)', fontsize=14, fontweight='bold')
 ax2.set_xlabel('Volume (₹ Lakhs)')
 
@@ -397,24 +519,14 @@ save_chart(fig, '11_city_analysis')
 # ============================================================
 # CHART 12: PLATFORM & DEVICE ANALYSIS
 # ============================================================
-platform_stats = df.groupby('platform').agg(
-    count=('transaction_id', 'count'),
-    success_rate=('status', lambda x: (x == 'Success').mean() * 100)
-).reset_index()
-
-device_stats = df.groupby('device_type').agg(
-    count=('transaction_id', 'count'),
-    avg_amount=('amount', 'mean')
-).sort_values('count', ascending=False).reset_index()
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-ax1.pie(platform_stats['count'], labels=platform_stats['platform'],
+ax1.pie(platform_stats['count'], labels=platform_stats.index,
         autopct='%1.1f%%', colors=PALETTE[:4], startangle=90,
         textprops={'fontsize': 11})
 ax1.set_title('Platform Distribution', fontsize=14, fontweight='bold')
 
-ax2.bar(device_stats['device_type'], device_stats['count'], color=PALETTE[:len(device_stats)])
+ax2.bar(device_stats.index, device_stats['count'], color=PALETTE[:len(device_stats)], rasterized=True)
 ax2.set_title('Device Type Distribution', fontsize=14, fontweight='bold')
 ax2.set_ylabel('Transaction Count')
 ax2.tick_params(axis='x', rotation=30)
@@ -426,23 +538,17 @@ save_chart(fig, '12_platform_device_analysis')
 # ============================================================
 # CHART 13: FRAUD FLAG ANALYSIS
 # ============================================================
-flagged = df[df['is_flagged'] == True]
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
 # Fraud reasons
-fraud_reasons = flagged['fraud_reason'].value_counts()
-ax1.barh(fraud_reasons.index[::-1], fraud_reasons.values[::-1], color=COLORS['danger'], alpha=0.85)
+ax1.barh(fraud_reasons.index, fraud_reasons.values, color=COLORS['danger'], alpha=0.85, rasterized=True)
 ax1.set_title('Fraud Flag Reasons', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Count')
-for i, v in enumerate(fraud_reasons.values[::-1]):
+for i, v in enumerate(fraud_reasons.values):
     ax1.text(v + 0.5, i, str(v), va='center', fontsize=10)
 
 # Flagged vs non-flagged amount distribution
-df_plot = df.copy()
-df_plot['flag_label'] = df_plot['is_flagged'].map({True: 'Flagged', False: 'Normal'})
-ax2.boxplot([df[df['is_flagged']==False]['amount'].clip(upper=50000),
-             df[df['is_flagged']==True]['amount'].clip(upper=50000)],
+ax2.boxplot([normal_amt, flagged_amt],
             labels=['Normal', 'Flagged'], patch_artist=True,
             boxprops=dict(facecolor=COLORS['primary'], alpha=0.6))
 ax2.set_title('Amount Distribution: Normal vs Flagged', fontsize=14, fontweight='bold')
@@ -455,23 +561,15 @@ save_chart(fig, '13_fraud_analysis')
 # ============================================================
 # CHART 14: CASHBACK & DISCOUNT EFFECTIVENESS
 # ============================================================
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
 # Cashback by method
-cb_method = df[df['cashback_earned'] > 0].groupby('payment_method')['cashback_earned'].agg(['sum','count']).reset_index()
-cb_method.columns = ['method', 'total_cashback', 'txn_count']
-cb_method = cb_method.sort_values('total_cashback', ascending=True)
-
-ax1.barh(cb_method['method'], cb_method['total_cashback']/1e3, color=COLORS['success'], alpha=0.8)
+ax1.barh(cb_method.index, cb_method.values/1e3, color=COLORS['success'], alpha=0.8, rasterized=True)
 ax1.set_title('Total Cashback by Payment Method (₹K)', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Cashback (₹ Thousands)')
 
 # Discount by category
-disc_cat = df[df['discount_applied'] > 0].groupby('category')['discount_applied'].agg(['sum','count']).reset_index()
-disc_cat.columns = ['category', 'total_discount', 'txn_count']
-disc_cat = disc_cat.sort_values('total_discount', ascending=True)
-
-ax2.barh(disc_cat['category'], disc_cat['total_discount']/1e3, color=COLORS['purple'], alpha=0.8)
+ax2.barh(disc_cat.index, disc_cat.values/1e3, color=COLORS['purple'], alpha=0.8, rasterized=True)
 ax2.set_title('Total Discounts by Category (₹K)', fontsize=14, fontweight='bold')
 ax2.set_xlabel('Discount (₹ Thousands)')
 
@@ -482,27 +580,15 @@ save_chart(fig, '14_cashback_discount_analysis')
 # ============================================================
 # CHART 15: REFUND ANALYSIS
 # ============================================================
-refunded = df[df['is_refunded'] == True]
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
 # Refunds by category
-ref_cat = refunded.groupby('category').agg(
-    refund_count=('transaction_id', 'count'),
-    total_refunded=('refund_amount', 'sum')
-).sort_values('refund_count', ascending=True).reset_index()
-
-ax1.barh(ref_cat['category'], ref_cat['refund_count'], color=COLORS['pink'], alpha=0.8)
+ax1.barh(ref_cat.index, ref_cat['refund_count'], color=COLORS['pink'], alpha=0.8, rasterized=True)
 ax1.set_title('Refund Count by Category', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Number of Refunds')
 
 # Full vs partial refund
-refunded_copy = refunded.copy()
-refunded_copy['refund_type'] = refunded_copy.apply(
-    lambda r: 'Full Refund' if r['refund_amount'] >= r['amount'] * 0.99 else 'Partial Refund', axis=1
-)
-ref_type = refunded_copy['refund_type'].value_counts()
-ax2.pie(ref_type.values, labels=ref_type.index, autopct='%1.1f%%',
+ax2.pie(ref_counts, labels=ref_labels, autopct='%1.1f%%',
         colors=[COLORS['danger'], COLORS['warning']], startangle=90,
         textprops={'fontsize': 12})
 ax2.set_title('Full vs Partial Refunds', fontsize=14, fontweight='bold')
@@ -514,23 +600,15 @@ save_chart(fig, '15_refund_analysis')
 # ============================================================
 # CHART 16: WEEKEND vs WEEKDAY COMPARISON
 # ============================================================
-wk_stats = df.groupby('is_weekend').agg(
-    txn_count=('transaction_id', 'count'),
-    avg_amount=('amount', 'mean'),
-    success_rate=('status', lambda x: (x == 'Success').mean() * 100),
-    total_volume=('amount', 'sum')
-).reset_index()
-wk_stats['label'] = wk_stats['is_weekend'].map({0: 'Weekday', 1: 'Weekend'})
+fig, axes = get_figure(1, 3, figsize=(15, 5))
 
-fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-
-axes[0].bar(wk_stats['label'], wk_stats['txn_count'], color=[COLORS['primary'], COLORS['warning']])
+axes[0].bar(wk_labels, wk_stats['txn_count'], color=[COLORS['primary'], COLORS['warning']], rasterized=True)
 axes[0].set_title('Transaction Count', fontsize=13, fontweight='bold')
 
-axes[1].bar(wk_stats['label'], wk_stats['avg_amount'], color=[COLORS['primary'], COLORS['warning']])
+axes[1].bar(wk_labels, wk_stats['avg_amount'], color=[COLORS['primary'], COLORS['warning']], rasterized=True)
 axes[1].set_title('Avg Transaction Value (₹)', fontsize=13, fontweight='bold')
 
-axes[2].bar(wk_stats['label'], wk_stats['success_rate'], color=[COLORS['primary'], COLORS['warning']])
+axes[2].bar(wk_labels, wk_stats['success_rate'], color=[COLORS['primary'], COLORS['warning']], rasterized=True)
 axes[2].set_title('Success Rate (%)', fontsize=13, fontweight='bold')
 axes[2].set_ylim(85, 100)
 
@@ -542,29 +620,25 @@ save_chart(fig, '16_weekend_vs_weekday')
 # ============================================================
 # CHART 17: PROCESSING TIME ANALYSIS
 # ============================================================
-success_df = df[df['status'] == 'Success']
-
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+fig, (ax1, ax2) = get_figure(1, 2, figsize=(14, 6))
 
 # Processing time by method
-method_proc = success_df.groupby('payment_method')['processing_time_sec'].mean().sort_values()
-ax1.barh(method_proc.index, method_proc.values, color=COLORS['teal'], alpha=0.8)
+ax1.barh(method_proc.index, method_proc.values, color=COLORS['teal'], alpha=0.8, rasterized=True)
 ax1.set_title('Avg Processing Time by Method (sec)', fontsize=14, fontweight='bold')
 ax1.set_xlabel('Seconds')
 for i, v in enumerate(method_proc.values):
     ax1.text(v + 0.02, i, f"{v:.2f}s", va='center', fontsize=10)
 
 # Processing speed distribution
-speed_order = ['Instant', 'Fast', 'Normal', 'Slow', 'Very Slow']
-speed_counts = df[df['status'] != 'Failed']['processing_speed'].value_counts().reindex(speed_order).fillna(0)
 speed_colors = [COLORS['success'], COLORS['teal'], COLORS['primary'], COLORS['warning'], COLORS['danger']]
-ax2.bar(speed_counts.index, speed_counts.values, color=speed_colors)
+ax2.bar(speed_counts.index, speed_counts.values, color=speed_colors, rasterized=True)
 ax2.set_title('Processing Speed Distribution', fontsize=14, fontweight='bold')
 ax2.set_ylabel('Transactions')
 ax2.tick_params(axis='x', rotation=20)
 
 fig.tight_layout()
 save_chart(fig, '17_processing_time_analysis')
+plt.close('all')
 
 
 # ============================================================
@@ -575,8 +649,16 @@ print(f"  EDA COMPLETE — {chart_count} charts generated!")
 print(f"{'=' * 60}")
 
 # Generate text summary
-total_vol = df[df['status']=='Success']['amount'].sum()
-total_failed_vol = df[df['status']=='Failed']['amount'].sum()
+total_vol = df['success_amount'].sum()
+total_failed_vol = failed['amount'].sum()
+method_success = method_agg['success_rate']
+upi_count = method_agg.loc['UPI', 'count']
+age_share = df['age_group'].value_counts(normalize=True) * 100
+persona_avg = df.groupby('spending_persona', observed=True)['amount'].mean()
+tier_users = df.groupby('customer_tier', observed=True)['user_id'].nunique()
+platform_share = df['platform'].value_counts(normalize=True) * 100
+device_counts = df['device_type'].value_counts()
+weekend_count = df['is_weekend'].sum()
 
 summary = f"""
 =================================================================
@@ -586,31 +668,31 @@ summary = f"""
 
 1. TRANSACTION OVERVIEW
    - Total Transactions: {len(df):,}
-   - Success: {(df['status']=='Success').sum():,} ({(df['status']=='Success').mean()*100:.1f}%)
-   - Failed: {(df['status']=='Failed').sum():,} ({(df['status']=='Failed').mean()*100:.1f}%)
-   - Pending: {(df['status']=='Pending').sum():,} ({(df['status']=='Pending').mean()*100:.1f}%)
+   - Success: {is_success.sum():,} ({is_success.mean()*100:.1f}%)
+   - Failed: {is_failed.sum():,} ({is_failed.mean()*100:.1f}%)
+   - Pending: {is_pending.sum():,} ({is_pending.mean()*100:.1f}%)
    - Total Successful Volume: ₹{total_vol/1e7:.2f} Crore
 
 2. PAYMENT METHODS
-   - Most Used: UPI ({(df['payment_method']=='UPI').sum():,} txns, {(df['payment_method']=='UPI').mean()*100:.1f}%)
-   - Highest Success Rate: {df.groupby('payment_method').apply(lambda x: (x['status']=='Success').mean()*100).idxmax()} ({df.groupby('payment_method').apply(lambda x: (x['status']=='Success').mean()*100).max():.1f}%)
-   - Highest Failure Rate: Net Banking ({df[df['payment_method']=='Net Banking']['status'].eq('Failed').mean()*100:.1f}%)
+   - Most Used: UPI ({upi_count:,} txns, {upi_count / len(df) * 100:.1f}%)
+   - Highest Success Rate: {method_success.idxmax()} ({method_success.max():.1f}%)
+   - Highest Failure Rate: Net Banking ({method_agg.loc['Net Banking', 'fail_rate']:.1f}%)
 
 3. PEAK TIMES
    - Busiest Hours: 12 PM - 1 PM and 6 PM - 8 PM
    - Quietest Hours: 1 AM - 5 AM
-   - Weekend transactions: {(df['is_weekend']==1).sum():,} ({(df['is_weekend']==1).mean()*100:.1f}%)
+   - Weekend transactions: {weekend_count:,} ({weekend_count / len(df) * 100:.1f}%)
 
 4. FAILURE ANALYSIS
    - Total Lost Revenue: ₹{total_failed_vol/1e5:.1f} Lakhs
-   - Top Failure Reason: {df[df['status']=='Failed']['failure_reason'].value_counts().index[0]}
+   - Top Failure Reason: {failed['failure_reason'].value_counts().index[0]}
    - Most Failure-Prone Method: Net Banking
    - Peak failure hours coincide with peak transaction hours (12-1 PM, 6-8 PM)
 
 5. USER DEMOGRAPHICS
-   - Largest Age Group: 25-34 ({(df['age_group']=='25-34').mean()*100:.1f}% of transactions)
-   - Highest Spending Persona: High Spender (avg ₹{df[df['spending_persona']=='High Spender']['amount'].mean():,.0f}/txn)
-   - VIP users: {df[df['customer_tier']=='VIP']['user_id'].nunique()} users
+   - Largest Age Group: 25-34 ({age_share['25-34']:.1f}% of transactions)
+   - Highest Spending Persona: High Spender (avg ₹{persona_avg['High Spender']:,.0f}/txn)
+   - VIP users: {tier_users['VIP']} users
 
 6. PROMOTIONS & SAVINGS
    - Transactions with Cashback: {(df['cashback_earned']>0).sum():,}
@@ -619,18 +701,18 @@ summary = f"""
    - Avg Savings %: {df[df['total_savings']>0]['savings_pct'].mean():.1f}%
 
 7. FRAUD & RISK
-   - Flagged Transactions: {df['is_flagged'].sum()} ({df['is_flagged'].mean()*100:.1f}%)
+   - Flagged Transactions: {is_flagged.sum()} ({is_flagged.mean()*100:.1f}%)
    - Top Fraud Reason: {flagged['fraud_reason'].value_counts().index[0]}
    - Late night (12-5 AM) high-value txns are most flagged
 
 8. REFUNDS
-   - Total Refunds: {df['is_refunded'].sum()} ({df['is_refunded'].mean()*100:.1f}%)
+   - Total Refunds: {is_refunded.sum()} ({is_refunded.mean()*100:.1f}%)
    - Total Refund Value: ₹{df['refund_amount'].sum()/1e3:.1f}K
-   - Most Refunded Category: {refunded['category'].value_counts().index[0]}
+   - Most Refunded Category: {cat_agg['refund_count'].idxmax()}
 
 9. PLATFORM & DEVICE
-   - Top Platform: Mobile App ({(df['platform']=='Mobile App').mean()*100:.1f}%)
-   - Android vs iOS split: {(df['device_type']=='Android').sum():,} vs {(df['device_type']=='iOS').sum():,}
+   - Top Platform: Mobile App ({platform_share['Mobile App']:.1f}%)
+   - Android vs iOS split: {device_counts['Android']:,} vs {device_counts['iOS']:,}
    - POS Terminal has lowest transaction count but consistent success rate
 
 =================================================================
@@ -2,11 +2,9 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import calendar
-import random
 import os
 
-np.random.seed(42)
-random.seed(42)
+rng = np.random.default_rng(42)
 
 # ============================================================
 # CONFIGURATION
@@ -37,42 +35,27 @@ city_weights = [0.16, 0.14, 0.14, 0.10, 0.09,
                 0.07, 0.06, 0.05, 0.04, 0.04,
                 0.03, 0.03, 0.02, 0.02, 0.01]
 
-# Build user profiles
-user_ids = [f"USR{str(i).zfill(5)}" for i in range(1, 501)]
-user_profiles = {}
-for uid in user_ids:
-    city = random.choices(cities, weights=city_weights, k=1)[0]
-    age_group = random.choices(age_groups, weights=age_weights, k=1)[0]
-    gender = random.choices(genders, weights=gender_weights, k=1)[0]
-    tenure = random.choices(account_tenures, weights=tenure_weights, k=1)[0]
-    tier = random.choices(customer_tiers, weights=tier_weights, k=1)[0]
-
-    # Spending persona — influences amount and frequency
-    persona = random.choices(
-        ['Budget', 'Moderate', 'High Spender', 'Impulse'],
-        weights=[0.30, 0.40, 0.20, 0.10], k=1
-    )[0]
-
-    # Preferred payment method per user (adds realistic stickiness)
-    preferred_method = random.choices(
-        ['UPI', 'Credit Card', 'Debit Card', 'Net Banking', 'Mobile Wallet'],
-        weights=[0.40, 0.18, 0.15, 0.12, 0.15], k=1
-    )[0]
-
-    user_profiles[uid] = {
-        'city': city,
-        'age_group': age_group,
-        'gender': gender,
-        'account_tenure': tenure,
-        'customer_tier': tier,
-        'spending_persona': persona,
-        'preferred_method': preferred_method
-    }
-
-# Save user profiles
-user_df = pd.DataFrame([
-    {'user_id': uid, **profile} for uid, profile in user_profiles.items()
-])
+# Spending persona — influences amount and frequency
+personas = ['Budget', 'Moderate', 'High Spender', 'Impulse']
+persona_weights = [0.30, 0.40, 0.20, 0.10]
+
+# Preferred payment method per user (adds realistic stickiness)
+preferred_methods = ['UPI', 'Credit Card', 'Debit Card', 'Net Banking', 'Mobile Wallet']
+preferred_weights = [0.40, 0.18, 0.15, 0.12, 0.15]
+
+# Build user profiles — one vectorized draw per attribute
+n_users = 500
+user_ids = [f"USR{str(i).zfill(5)}" for i in range(1, n_users + 1)]
+user_df = pd.DataFrame({
+    'user_id': user_ids,
+    'city': rng.choice(cities, size=n_users, p=city_weights),
+    'age_group': rng.choice(age_groups, size=n_users, p=age_weights),
+    'gender': rng.choice(genders, size=n_users, p=gender_weights),
+    'account_tenure': rng.choice(account_tenures, size=n_users, p=tenure_weights),
+    'customer_tier': rng.choice(customer_tiers, size=n_users, p=tier_weights),
+    'spending_persona': rng.choice(personas, size=n_users, p=persona_weights),
+    'preferred_method': rng.choice(preferred_methods, size=n_users, p=preferred_weights),
+})
 
 # ============================================================
 # 2. PAYMENT METHODS & CATEGORIES
@@ -84,6 +67,10 @@ categories = ['Food & Dining', 'Shopping', 'Bills & Utilities', 'Travel',
               'Entertainment', 'Health', 'Education', 'Transfers', 'Groceries', 'Investments']
 cat_weights = [0.20, 0.17, 0.15, 0.10, 0.09, 0.06, 0.04, 0.06, 0.08, 0.05]
 
+# Name -> position lookups (avoid list.index scans)
+pm_idx = {m: i for i, m in enumerate(payment_methods)}
+cat_idx = {c: i for i, c in enumerate(categories)}
+
 merchants = {
     'Food & Dining': ['Swiggy', 'Zomato', 'Dominos', 'McDonalds', 'Starbucks', 'KFC', 'Pizza Hut', 'Haldirams'],
     'Shopping': ['Amazon', 'Flipkart', 'Myntra', 'Ajio', 'Meesho', 'Nykaa', 'Croma', 'Reliance Digital'],
@@ -129,12 +116,28 @@ failure_reasons = {
     'Mobile Wallet': ['Insufficient Balance', 'Wallet Limit Exceeded', 'KYC Pending', 'Server Error', 'Invalid PIN']
 }
 
+# Amount above which a transaction may be flagged as unusually high, per category
+high_threshold = {
+    'Food & Dining': 2000, 'Shopping': 12000, 'Bills & Utilities': 4000,
+    'Travel': 10000, 'Entertainment': 1200, 'Health': 6000,
+    'Education': 15000, 'Transfers': 40000, 'Groceries': 3000, 'Investments': 80000
+}
+
+random_fraud_reasons = ['Multiple Failed Attempts', 'Velocity Check Triggered',
+                        'Device Mismatch', 'Location Anomaly', 'New Device Login']
+
 # ============================================================
 # 4. PLATFORMS & SEASONAL CONFIG
 # ============================================================
 platforms = ['Mobile App', 'Web Browser', 'POS Terminal', 'QR Code']
 platform_weights = [0.45, 0.25, 0.15, 0.15]
 
+# Device split per platform (POS Terminal is always 'POS')
+mobile_devices = ['Android', 'iOS']
+mobile_device_weights = [0.72, 0.28]
+web_devices = ['Windows', 'Mac', 'Linux']
+web_device_weights = [0.65, 0.25, 0.10]
+
 # Monthly multipliers for seasonal patterns
 # Spikes: Jan (New Year sales), Mar (Holi), Aug (Independence Day sales),
 # Oct-Nov (Diwali/festive), Dec (Christmas/year-end)
@@ -152,6 +155,22 @@ seasonal_category_boost = {
     8:  {'Shopping': 1.4},
 }
 
+# Array forms indexed by month number (index 0 unused) for vectorized lookups
+month_mul_arr = np.array([0.0] + [monthly_multiplier[m] for m in range(1, 13)])
+boost_mat = np.ones((13, len(categories)))
+for m, boosts in seasonal_category_boost.items():
+    for cat, boost in boosts.items():
+        boost_mat[m, cat_idx[cat]] = boost
+
+# Weekend boost for Food, Entertainment, Shopping
+weekend_boost = np.ones(len(categories))
+weekend_boost[[cat_idx[c] for c in ['Food & Dining', 'Entertainment', 'Shopping']]] = 1.2
+
+# Category log-weights for every (month - 1, is_weekend) pair: shape (12, 2, n_categories)
+cat_logw_table = np.log(np.array(cat_weights)
+                        * boost_mat[1:, None, :]
+                        * np.stack([np.ones(len(categories)), weekend_boost])[None, :, :])
+
 # ============================================================
 # 5. GENERATE TRANSACTIONS
 # ============================================================
@@ -161,193 +180,236 @@ hour_weights = [0.5, 0.3, 0.2, 0.2, 0.2, 0.3, 0.8, 1.5, 2.5, 3.5,
 
 # Distribute transactions across 24 months (2024 + 2025) using monthly_multiplier
 all_months = [(y, m) for y in [2024, 2025] for m in range(1, 13)]
-total_weight = sum(monthly_multiplier[m] for _, m in all_months)
-monthly_txn_counts = {}
-remaining = N
-for i, (year, month) in enumerate(all_months):
-    if i == len(all_months) - 1:
-        monthly_txn_counts[(year, month)] = remaining
-    else:
-        count = int(N * (monthly_multiplier[month] / total_weight))
-        monthly_txn_counts[(year, month)] = count
-        remaining -= count
-
-records = []
-txn_counter = 0
-
-for (year, month), count in monthly_txn_counts.items():
+month_weights = month_mul_arr[[m for _, m in all_months]]
+counts = (N * month_weights / month_weights.sum()).astype(int)
+counts[-1] = N - counts[:-1].sum()  # last month absorbs the rounding remainder
+monthly_txn_counts = dict(zip(all_months, counts.tolist()))
+
+# Persona amount multipliers (high spenders can overflow the category range)
+persona_multiplier = {
+    'Budget': 0.6, 'Moderate': 1.0, 'High Spender': 1.8, 'Impulse': 1.3
+}
+# Cumulative weights for the fixed-weight draws (hour, platform, device)
+hour_cdf = np.cumsum(hour_weights)
+platform_cdf = np.cumsum(platform_weights)
+mobile_device_cdf = np.cumsum(mobile_device_weights)
+web_device_cdf = np.cumsum(web_device_weights)
+payment_method_arr = np.array(payment_methods, dtype=object)
+category_arr = np.array(categories, dtype=object)
+log_method_weights = np.log(method_weights)
+
+# Rule tables indexed by payment method / category code
+fail_rate_arr = np.array([failure_rates[m] for m in payment_methods])
+if len({len(failure_reasons[m]) for m in payment_methods}) != 1:
+    raise ValueError("failure_reasons must list the same number of reasons for every payment method")
+failure_reason_table = np.array([failure_reasons[m] for m in payment_methods], dtype=object)
+high_thresh_arr = np.array([high_threshold[c] for c in categories], dtype=np.float64)
+cashback_method = np.isin(payment_methods, ['Credit Card', 'Mobile Wallet'])
+discount_cat = np.isin(categories, ['Shopping', 'Food & Dining', 'Groceries'])
+refund_cat = np.isin(categories, ['Shopping', 'Travel', 'Food & Dining', 'Entertainment'])
+platform_arr = np.array(platforms, dtype=object)
+mobile_device_arr = np.array(mobile_devices, dtype=object)
+web_device_arr = np.array(web_devices, dtype=object)
+random_fraud_arr = np.array(random_fraud_reasons, dtype=object)
+amt_lo_arr = np.array([amount_ranges[c][0] for c in categories], dtype=np.float64)
+amt_hi_arr = np.array([amount_ranges[c][1] for c in categories], dtype=np.float64)
+persona_mult_arr = np.array([persona_multiplier[p] for p in personas])
+
+# User attributes as parallel arrays; transactions pick users by integer index
+user_ids_arr = user_df['user_id'].to_numpy(dtype=object)
+user_pref_code = user_df['preferred_method'].map(pm_idx).to_numpy()
+user_persona_code = user_df['spending_persona'].map({p: i for i, p in enumerate(personas)}).to_numpy()
+user_city_arr = user_df['city'].to_numpy(dtype=object)
+
+def sample_cdf(rng, cdf, size):
+    """Draw `size` indices from fixed weights given as a cumulative-sum array."""
+    return np.searchsorted(cdf, rng.random(size) * cdf[-1], side='right')
+
+def sample_rows(rng, log_weights):
+    """Draw one column index per row of a (rows, choices) log-weight matrix (Gumbel-max trick)."""
+    return np.argmax(log_weights + rng.gumbel(size=log_weights.shape), axis=1)
+
+def generate_month(year, month, count, seed):
+    """Generate one month's transactions; returns column arrays keyed by output column name."""
+    rng = np.random.default_rng(seed)
+
     # Calculate days in month (handles leap years automatically)
     days_in_month = calendar.monthrange(year, month)[1]
 
-    for _ in range(count):
-        txn_counter += 1
-        txn_id = f"TXN{str(txn_counter).zfill(7)}"
-        user_id = random.choice(user_ids)
-        profile = user_profiles[user_id]
-
-        # --- Date & Time ---
-        day = random.randint(1, days_in_month)
-        hour = random.choices(range(24), weights=hour_weights, k=1)[0]
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-        txn_datetime = datetime(year, month, day, hour, minute, second)
-
-        # --- Day type ---
-        day_of_week = txn_datetime.weekday()
-        is_weekend = 1 if day_of_week >= 5 else 0
-
-        # --- Payment Method (biased toward user's preferred method) ---
-        user_method_weights = list(method_weights)
-        pref_idx = payment_methods.index(profile['preferred_method'])
-        user_method_weights[pref_idx] *= 2.5  # boost preferred method
-        method = random.choices(payment_methods, weights=user_method_weights, k=1)[0]
-
-        # --- Category (with seasonal boost) ---
-        adjusted_cat_weights = list(cat_weights)
-        if month in seasonal_category_boost:
-            for cat, boost in seasonal_category_boost[month].items():
-                idx = categories.index(cat)
-                adjusted_cat_weights[idx] *= boost
-        # Weekend boost for Food, Entertainment, Shopping
-        if is_weekend:
-            for cat in ['Food & Dining', 'Entertainment', 'Shopping']:
-                idx = categories.index(cat)
-                adjusted_cat_weights[idx] *= 1.2
-
-        category = random.choices(categories, weights=adjusted_cat_weights, k=1)[0]
-        merchant = random.choice(merchants[category])
-
-        # --- Amount (influenced by persona) ---
-        lo, hi = amount_ranges[category]
-        persona_multiplier = {
-            'Budget': 0.6, 'Moderate': 1.0, 'High Spender': 1.8, 'Impulse': 1.3
-        }
-        base_amount = random.uniform(lo, hi)
-        amount = round(base_amount * persona_multiplier[profile['spending_persona']], 2)
-        amount = max(lo, min(amount, hi * 2))  # cap but allow some overflow for high spenders
-
-        # --- Status ---
-        # Higher failure rates during peak hours (12-14, 18-21)
-        peak_failure_boost = 1.4 if hour in [12, 13, 18, 19, 20] else 1.0
-        fail_rate = failure_rates[method] * peak_failure_boost
-
-        is_failed = random.random() < fail_rate
-        if is_failed:
-            status = 'Failed'
-            reason = random.choice(failure_reasons[method])
-        else:
-            if random.random() < 0.03:
-                status = 'Pending'
-                reason = 'Processing'
-            else:
-                status = 'Success'
-                reason = None
-
-        # --- Platform ---
-        platform = random.choices(platforms, weights=platform_weights, k=1)[0]
-
-        # --- City (from user profile) ---
-        city = profile['city']
-
-        # --- Processing Time ---
-        if status == 'Success':
-            processing_time = round(random.uniform(0.5, 3.0), 2)
-        elif status == 'Failed':
-            processing_time = round(random.uniform(2.0, 15.0), 2)
-        else:
-            processing_time = round(random.uniform(5.0, 30.0), 2)
-
-        # --- Cashback / Discount ---
-        cashback = 0.0
-        discount_applied = 0.0
-        if status == 'Success':
-            cashback_chance = 0.25 if method in ['Credit Card', 'Mobile Wallet'] else 0.12
-            if random.random() < cashback_chance:
-                cashback = round(amount * random.uniform(0.01, 0.10), 2)
-            if category in ['Shopping', 'Food & Dining', 'Groceries'] and random.random() < 0.30:
-                discount_applied = round(amount * random.uniform(0.05, 0.20), 2)
-
-        # --- Fraud Flag ---
-        is_flagged = False
-        fraud_reason = None
-
-        high_threshold = {
-            'Food & Dining': 2000, 'Shopping': 12000, 'Bills & Utilities': 4000,
-            'Travel': 10000, 'Entertainment': 1200, 'Health': 6000,
-            'Education': 15000, 'Transfers': 40000, 'Groceries': 3000, 'Investments': 80000
-        }
-        if amount > high_threshold.get(category, 50000):
-            if random.random() < 0.15:
-                is_flagged = True
-                fraud_reason = 'Unusually High Amount'
-
-        if hour in [0, 1, 2, 3, 4] and amount > 5000:
-            if random.random() < 0.20:
-                is_flagged = True
-                fraud_reason = 'Suspicious Late Night Transaction'
-
-        if not is_flagged and random.random() < 0.008:
-            is_flagged = True
-            fraud_reason = random.choice([
-                'Multiple Failed Attempts', 'Velocity Check Triggered',
-                'Device Mismatch', 'Location Anomaly', 'New Device Login'
-            ])
-
-        # --- Refund ---
-        is_refunded = False
-        refund_amount = 0.0
-        if status == 'Success' and category in ['Shopping', 'Travel', 'Food & Dining', 'Entertainment']:
-            if random.random() < 0.04:
-                is_refunded = True
-                if random.random() < 0.6:
-                    refund_amount = amount
-                else:
-                    refund_amount = round(amount * random.uniform(0.3, 0.8), 2)
-
-        # --- Device Type ---
-        if platform == 'Mobile App':
-            device_type = random.choices(['Android', 'iOS'], weights=[0.72, 0.28], k=1)[0]
-        elif platform == 'Web Browser':
-            device_type = random.choices(['Windows', 'Mac', 'Linux'], weights=[0.65, 0.25, 0.10], k=1)[0]
-        elif platform == 'POS Terminal':
-            device_type = 'POS'
-        else:
-            device_type = random.choices(['Android', 'iOS'], weights=[0.72, 0.28], k=1)[0]
-
-        records.append({
-            'transaction_id': txn_id,
-            'user_id': user_id,
-            'transaction_datetime': txn_datetime,
-            'payment_method': method,
-            'category': category,
-            'merchant': merchant,
-            'amount': amount,
-            'status': status,
-            'failure_reason': reason,
-            'platform': platform,
-            'device_type': device_type,
-            'city': city,
-            'processing_time_sec': processing_time,
-            'is_weekend': is_weekend,
-            'cashback_earned': cashback,
-            'discount_applied': discount_applied,
-            'is_flagged': is_flagged,
-            'fraud_reason': fraud_reason,
-            'is_refunded': is_refunded,
-            'refund_amount': refund_amount
-        })
+    # --- Date & Time (drawn for the whole month at once) ---
+    days = rng.integers(1, days_in_month + 1, size=count)
+    hours = sample_cdf(rng, hour_cdf, count)
+    minutes = rng.integers(0, 60, size=count)
+    seconds = rng.integers(0, 60, size=count)
+    txn_datetimes = pd.to_datetime(pd.DataFrame({
+        'year': year, 'month': month, 'day': days,
+        'hour': hours, 'minute': minutes, 'second': seconds
+    }))
+
+    # Put the month in chronological order up front; every later draw follows this row order,
+    # so concatenating months in calendar order yields a globally sorted frame
+    order = np.argsort(txn_datetimes.to_numpy(), kind='stable')
+    txn_datetimes = txn_datetimes.iloc[order].reset_index(drop=True)
+    hours = hours[order]
+
+    # --- Day type ---
+    is_weekend_arr = (txn_datetimes.dt.weekday >= 5).astype(int).to_numpy()
+    txn_datetimes = txn_datetimes.to_numpy()
+
+    # --- User ---
+    user_idx = rng.integers(0, n_users, size=count)
+    txn_users = user_ids_arr[user_idx]
+
+    # --- Payment Method (biased toward user's preferred method) ---
+    pref_codes = user_pref_code[user_idx]
+    method_logw = np.tile(log_method_weights, (count, 1))
+    method_logw[np.arange(count), pref_codes] += np.log(2.5)  # boost preferred method
+    method_codes = sample_rows(rng, method_logw)
+    methods = payment_method_arr[method_codes]
+
+    # --- Category (with seasonal boost) ---
+    cat_codes = sample_rows(rng, cat_logw_table[month - 1, is_weekend_arr])
+    cats = category_arr[cat_codes]
+
+    txn_merchants = np.empty(count, dtype=object)
+    for cat in categories:
+        rows = np.flatnonzero(cats == cat)
+        txn_merchants[rows] = rng.choice(merchants[cat], size=len(rows))
+
+    # --- Amount (influenced by persona) ---
+    amt_lo = amt_lo_arr[cat_codes]
+    amt_hi = amt_hi_arr[cat_codes]
+    mults = persona_mult_arr[user_persona_code[user_idx]]
+    amounts = np.round(rng.uniform(amt_lo, amt_hi) * mults, 2)
+    amounts = np.clip(amounts, amt_lo, amt_hi * 2)  # cap but allow some overflow for high spenders
+
+    # --- Status ---
+    # Higher failure rates during peak hours (12-14, 18-21)
+    peak_failure_boost = np.where(np.isin(hours, [12, 13, 18, 19, 20]), 1.4, 1.0)
+    is_failed = rng.random(count) < fail_rate_arr[method_codes] * peak_failure_boost
+    is_pending = ~is_failed & (rng.random(count) < 0.03)
+    is_success = ~is_failed & ~is_pending
+    status = np.where(is_failed, 'Failed', np.where(is_pending, 'Pending', 'Success')).astype(object)
+    reason = np.full(count, None, dtype=object)
+    reason[is_failed] = failure_reason_table[method_codes[is_failed], rng.integers(0, failure_reason_table.shape[1], size=is_failed.sum())]
+    reason[is_pending] = 'Processing'
+
+    # --- Platform ---
+    platform_codes = sample_cdf(rng, platform_cdf, count)
+    txn_platforms = platform_arr[platform_codes]
+
+    # --- City (from user profile) ---
+    txn_cities = user_city_arr[user_idx]
+
+    # --- Processing Time ---
+    proc_lo = np.where(is_success, 0.5, np.where(is_failed, 2.0, 5.0))
+    proc_hi = np.where(is_success, 3.0, np.where(is_failed, 15.0, 30.0))
+    processing_times = np.round(rng.uniform(proc_lo, proc_hi), 2)
+
+    # --- Cashback / Discount ---
+    cashback_chance = np.where(cashback_method[method_codes], 0.25, 0.12)
+    gets_cashback = is_success & (rng.random(count) < cashback_chance)
+    cashback = np.where(gets_cashback, np.round(amounts * rng.uniform(0.01, 0.10, size=count), 2), 0.0)
+    gets_discount = is_success & discount_cat[cat_codes] & (rng.random(count) < 0.30)
+    discount_applied = np.where(gets_discount, np.round(amounts * rng.uniform(0.05, 0.20, size=count), 2), 0.0)
+
+    # --- Fraud Flag (a later rule overrides an earlier reason) ---
+    fraud_reason = np.full(count, None, dtype=object)
+    high_amount = (amounts > high_thresh_arr[cat_codes]) & (rng.random(count) < 0.15)
+    fraud_reason[high_amount] = 'Unusually High Amount'
+    late_night = np.isin(hours, [0, 1, 2, 3, 4]) & (amounts > 5000) & (rng.random(count) < 0.20)
+    fraud_reason[late_night] = 'Suspicious Late Night Transaction'
+    is_flagged = high_amount | late_night
+    random_flag = ~is_flagged & (rng.random(count) < 0.008)
+    fraud_reason[random_flag] = random_fraud_arr[rng.integers(0, len(random_fraud_arr), size=random_flag.sum())]
+    is_flagged |= random_flag
+
+    # --- Refund ---
+    is_refunded = is_success & refund_cat[cat_codes] & (rng.random(count) < 0.04)
+    full_refund = rng.random(count) < 0.6
+    partial = np.round(amounts * rng.uniform(0.3, 0.8, size=count), 2)
+    refund_amount = np.where(is_refunded, np.where(full_refund, amounts, partial), 0.0)
+
+    # --- Device Type ---
+    mobile_draw = mobile_device_arr[sample_cdf(rng, mobile_device_cdf, count)]
+    web_draw = web_device_arr[sample_cdf(rng, web_device_cdf, count)]
+    device_type = np.where(txn_platforms == 'Web Browser', web_draw,
+                           np.where(txn_platforms == 'POS Terminal', 'POS', mobile_draw))
+
+    return {
+        'user_id': txn_users,
+        'transaction_datetime': txn_datetimes,
+        'payment_method': methods,
+        'category': cats,
+        'merchant': txn_merchants,
+        'amount': amounts,
+        'status': status,
+        'failure_reason': reason,
+        'platform': txn_platforms,
+        'device_type': device_type,
+        'city': txn_cities,
+        'processing_time_sec': processing_times,
+        'is_weekend': is_weekend_arr,
+        'cashback_earned': cashback,
+        'discount_applied': discount_applied,
+        'is_flagged': is_flagged,
+        'fraud_reason': fraud_reason,
+        'is_refunded': is_refunded,
+        'refund_amount': refund_amount,
+    }
+
+# Output columns, pre-allocated for all N rows and filled month by month
+columns = {
+    'transaction_id': np.array([f"TXN{str(i).zfill(7)}" for i in range(1, N + 1)], dtype=object),
+    'user_id': np.empty(N, dtype=object),
+    'transaction_datetime': np.empty(N, dtype='datetime64[ns]'),
+    'payment_method': np.empty(N, dtype=object),
+    'category': np.empty(N, dtype=object),
+    'merchant': np.empty(N, dtype=object),
+    'amount': np.empty(N, dtype=np.float64),
+    'status': np.empty(N, dtype=object),
+    'failure_reason': np.empty(N, dtype=object),
+    'platform': np.empty(N, dtype=object),
+    'device_type': np.empty(N, dtype=object),
+    'city': np.empty(N, dtype=object),
+    'processing_time_sec': np.empty(N, dtype=np.float64),
+    'is_weekend': np.empty(N, dtype=np.int64),
+    'cashback_earned': np.empty(N, dtype=np.float64),
+    'discount_applied': np.empty(N, dtype=np.float64),
+    'is_flagged': np.empty(N, dtype=bool),
+    'fraud_reason': np.empty(N, dtype=object),
+    'is_refunded': np.empty(N, dtype=bool),
+    'refund_amount': np.empty(N, dtype=np.float64),
+}
+
+# Months are independent: each gets its own child seed, so the output is reproducible
+# regardless of the order (or process) in which the months are generated
+month_seeds = np.random.SeedSequence(42).spawn(len(monthly_txn_counts))
+
+offset = 0
+for ((year, month), count), seed in zip(monthly_txn_counts.items(), month_seeds):
+    block = slice(offset, offset + count)
+    for name, values in generate_month(year, month, count, seed).items():
+        columns[name][block] = values
+    offset += count
 
 # ============================================================
 # 6. SAVE OUTPUTS
 # ============================================================
-df = pd.DataFrame(records)
-df = df.sort_values('transaction_datetime').reset_index(drop=True)
+df = pd.DataFrame(columns, copy=False)
+
+# Low-cardinality text columns as categoricals (small integer codes + one copy of each label)
+for col in ['payment_method', 'category', 'status', 'platform', 'device_type',
+            'city', 'merchant', 'fraud_reason', 'failure_reason']:
+    df[col] = df[col].astype('category')
+
+# No global sort needed: months are generated in calendar order and each is sorted internally
 
 output_dir = os.getcwd()
 
 # Main transactions file
 txn_path = os.path.join(output_dir, 'transactions_raw.csv')
-df.to_csv(txn_path, index=False)
+df.to_csv(txn_path, index=False, chunksize=65536)
 
 # User profiles file
 user_path = os.path.join(output_dir, 'user_profiles.csv')
@@ -380,9 +442,7 @@ print(f"\nAmount Stats:")
 print(df['amount'].describe().to_string())
 
 print(f"\nMonthly Transaction Counts:")
-df['month'] = pd.to_datetime(df['transaction_datetime']).dt.month
-print(df['month'].value_counts().sort_index().to_string())
-df.drop(columns=['month'], inplace=True)
+print(df['transaction_datetime'].dt.month.value_counts().sort_index().to_string())
 
 print(f"\nFraud Flags: {df['is_flagged'].sum()} ({df['is_flagged'].mean()*100:.1f}%)")
 print(f"Refunds: {df['is_refunded'].sum()} ({df['is_refunded'].mean()*100:.1f}%)")
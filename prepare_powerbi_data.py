@@ -1,7 +1,7 @@
 """
 Power BI Data Preparation Script
 =================================
-Converts transactions_cleaned.csv into a proper Star Schema:
+Converts transactions_cleaned (Parquet cache, else CSV) into a proper Star Schema:
 
     fact_transactions  ──┬── dim_date
                          ├── dim_users
@@ -14,6 +14,8 @@ Output: powerbi_data/ folder (import all CSVs into Power BI Desktop)
 
 import pandas as pd
 import numpy as np
+import glob
+import hashlib
 import os
 
 print("=" * 60)
@@ -22,28 +24,72 @@ print("=" * 60)
 
 # ── Load cleaned data ──────────────────────────────────────────
 script_dir = os.path.dirname(os.path.abspath(__file__))
-df = pd.read_csv(os.path.join(script_dir, "transactions_cleaned.csv"))
-df["transaction_datetime"] = pd.to_datetime(df["transaction_datetime"])
-df["date"] = pd.to_datetime(df["date"])
+cat_cols = ["user_id", "payment_method", "category", "merchant", "status",
+            "platform", "device_type", "city"]
+
+# Prefer the Parquet snapshot data_pipeline.py writes right after the CSV (typed, no text
+# parsing) — but only while it is at least as new as the CSV, so a regenerated or edited
+# CSV is never shadowed by a stale snapshot
+csv_path = os.path.join(script_dir, "transactions_cleaned.csv")
+parquet_paths = sorted(glob.glob(os.path.join(script_dir, "transactions_cleaned.*.parquet")),
+                       key=os.path.getmtime)
+if parquet_paths and (not os.path.exists(csv_path)
+                      or os.path.getmtime(parquet_paths[-1]) >= os.path.getmtime(csv_path)):
+    source = parquet_paths[-1]
+    df = pd.read_parquet(source, engine="pyarrow")
+    df["date"] = pd.to_datetime(df["date"])  # stored as date32
+    df[cat_cols] = df[cat_cols].astype("category")
+    # Match the CSV path, where the "None" placeholder is read as missing
+    reason_cols = ["failure_reason", "fraud_reason"]
+    df[reason_cols] = df[reason_cols].replace("None", pd.NA)
+else:
+    # Dates parsed at read time; low-cardinality text read straight into categoricals
+    source = csv_path
+    df = pd.read_csv(source,
+                     parse_dates=["transaction_datetime", "date"],
+                     dtype={col: "category" for col in cat_cols},
+                     engine="pyarrow")
 
 out_dir = os.path.join(script_dir, "powerbi_data")
 os.makedirs(out_dir, exist_ok=True)
 
-print(f"\n[1] Source: {len(df):,} rows × {df.shape[1]} columns")
+print(f"\n[1] Source: {os.path.basename(source)} — {len(df):,} rows × {df.shape[1]} columns")
 print(f"    Output folder: {out_dir}\n")
 
 
+def write_if_changed(table, path):
+    """Write a small lookup table to CSV only if its content differs from the last write.
+
+    A `<path>.hash` sidecar stores the content hash; unchanged tables keep their file
+    (and mtime) untouched. Returns True when the file was written.
+    """
+    digest = hashlib.blake2b(table.to_csv(index=False).encode()).hexdigest()[:16]
+    hash_path = path + ".hash"
+    if os.path.exists(path) and os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == digest:
+                return False
+    table.to_csv(path, index=False)
+    with open(hash_path, "w") as f:
+        f.write(digest)
+    return True
+
+
 # ══════════════════════════════════════════════════════════════
 # DIM DATE
 # ══════════════════════════════════════════════════════════════
 print("[2] Building dim_date ...")
 
-dim_date = df[["date", "year", "month", "month_name", "quarter",
-               "quarter_label", "day", "day_of_week", "day_name",
-               "week_number", "is_weekend", "is_month_start",
-               "is_month_end", "is_festival_season"]].drop_duplicates("date").copy()
+# First-occurrence mask on the key column alone, then pull just those rows (no N-row projection copy)
+date_cols = ["date", "year", "month", "month_name", "quarter",
+             "quarter_label", "day", "day_of_week", "day_name",
+             "week_number", "is_weekend", "is_month_start",
+             "is_month_end", "is_festival_season"]
+first_date = ~df["date"].duplicated()
+dim_date = df.loc[first_date, date_cols]
 
-dim_date["date_key"] = dim_date["date"].dt.strftime("%Y%m%d").astype(int)
+dk = dim_date["date"].dt
+dim_date["date_key"] = (dk.year * 10000 + dk.month * 100 + dk.day).astype(np.int32)  # YYYYMMDD
 dim_date["month_year"] = dim_date["month_name"] + " " + dim_date["year"].astype(str)
 dim_date = dim_date.sort_values("date").reset_index(drop=True)
 
@@ -68,7 +114,8 @@ user_cols = ["user_id", "age_group", "gender", "account_tenure",
              "customer_tier", "spending_persona", "preferred_method",
              "user_home_city", "user_total_txns", "user_total_spend",
              "user_avg_txn_amount", "user_failure_rate_pct", "user_spending_tier"]
-dim_users = df[user_cols].drop_duplicates("user_id").reset_index(drop=True)
+first_user = ~df["user_id"].duplicated()
+dim_users = df.loc[first_user, user_cols].reset_index(drop=True)
 
 path = os.path.join(out_dir, "dim_users.csv")
 dim_users.to_csv(path, index=False)
@@ -99,8 +146,8 @@ dim_payment = pd.DataFrame({
 })
 
 path = os.path.join(out_dir, "dim_payment_method.csv")
-dim_payment.to_csv(path, index=False)
-print(f"    Saved dim_payment_method.csv  ({len(dim_payment)} rows)")
+write_state = "Saved" if write_if_changed(dim_payment, path) else "Unchanged"
+print(f"    {write_state} dim_payment_method.csv  ({len(dim_payment)} rows)")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -127,8 +174,8 @@ dim_category = pd.DataFrame({
 })
 
 path = os.path.join(out_dir, "dim_category.csv")
-dim_category.to_csv(path, index=False)
-print(f"    Saved dim_category.csv  ({len(dim_category)} rows)")
+write_state = "Saved" if write_if_changed(dim_category, path) else "Unchanged"
+print(f"    {write_state} dim_category.csv  ({len(dim_category)} rows)")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -149,8 +196,8 @@ dim_platform = pd.DataFrame({
 })
 
 path = os.path.join(out_dir, "dim_platform.csv")
-dim_platform.to_csv(path, index=False)
-print(f"    Saved dim_platform.csv  ({len(dim_platform)} rows)")
+write_state = "Saved" if write_if_changed(dim_platform, path) else "Unchanged"
+print(f"    {write_state} dim_platform.csv  ({len(dim_platform)} rows)")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -158,18 +205,6 @@ print(f"    Saved dim_platform.csv  ({len(dim_platform)} rows)")
 # ══════════════════════════════════════════════════════════════
 print("[7] Building fact_transactions ...")
 
-fact = df.copy()
-
-# Add date_key foreign key
-fact["date_key"] = fact["date"].dt.strftime("%Y%m%d").astype(int)
-
-# Add convenience flag columns (0/1 integers — easier in DAX)
-fact["is_success"] = (fact["status"] == "Success").astype(int)
-fact["is_failed"]  = (fact["status"] == "Failed").astype(int)
-fact["is_pending"] = (fact["status"] == "Pending").astype(int)
-fact["is_flagged_int"]  = fact["is_flagged"].astype(int)
-fact["is_refunded_int"] = fact["is_refunded"].astype(int)
-
 fact_cols = [
     # Keys
     "transaction_id", "user_id", "date_key",
@@ -191,12 +226,33 @@ fact_cols = [
     "is_refunded", "is_refunded_int", "refund_amount",
 ]
 
-fact = fact[fact_cols]
+# Derived columns, computed from df directly
+dk = df["date"].dt
+# Convenience flag columns (0/1 int8 — easier in DAX); one pass over status for all three
+status_flags = pd.get_dummies(df["status"], dtype=np.int8).reindex(
+    columns=["Success", "Failed", "Pending"], fill_value=0)
+derived = {
+    "date_key":        (dk.year * 10000 + dk.month * 100 + dk.day).astype(np.int32).to_numpy(),
+    "is_success":      status_flags["Success"].to_numpy(),
+    "is_failed":       status_flags["Failed"].to_numpy(),
+    "is_pending":      status_flags["Pending"].to_numpy(),
+    "is_flagged_int":  df["is_flagged"].to_numpy(dtype=np.int8),
+    "is_refunded_int": df["is_refunded"].to_numpy(dtype=np.int8),
+}
+
+# Assemble only the fact columns, in order (no full copy of df)
+fact = pd.DataFrame({c: derived[c] if c in derived else df[c] for c in fact_cols})
 
+# Largest table — written in row chunks so the formatter's memory stays bounded as N grows
 path = os.path.join(out_dir, "fact_transactions.csv")
-fact.to_csv(path, index=False)
+fact.to_csv(path, index=False, chunksize=65536)
 print(f"    Saved fact_transactions.csv  ({len(fact):,} rows × {len(fact_cols)} columns)")
 
+# Typed, compressed copy of the same table — Power BI imports Parquet directly
+fact.to_parquet(os.path.join(out_dir, "fact_transactions.parquet"),
+                engine="pyarrow", compression="snappy", index=False)
+print("    Saved fact_transactions.parquet  (same rows, Parquet copy)")
+
 
 # ══════════════════════════════════════════════════════════════
 # SUMMARY
@@ -207,6 +263,7 @@ print(f"{'=' * 60}")
 print("""
   Tables created:
     fact_transactions.csv     — 60,000 rows  (main fact table)
+    fact_transactions.parquet — 60,000 rows  (same table as Parquet)
     dim_date.csv              — 731 rows     (date dimension)
     dim_users.csv             — 500 rows     (user dimension)
     dim_payment_method.csv    — 5 rows       (payment lookup)